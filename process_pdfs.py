@@ -8,25 +8,28 @@ import sys
 import time
 import json
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import multiprocessing as mp
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.pdf_extractor import extract_pdf_outline
+from src.pdf_extractor import extract_pdf_outline, write_outline_json
+from src.utils import worker_count_from_env
 
 
-def process_single_pdf(pdf_path: Path, output_dir: Path) -> dict:
-    """Process a single PDF file and return result info"""
+def process_single_pdf(pdf_path: Path, output_dir: Path, pdf_data: bytes = None) -> dict:
+    """Process a single PDF file (optionally from already-read bytes) and return result info"""
     try:
         start_time = time.time()
         
         # Generate output path
         output_file = output_dir / f"{pdf_path.stem}.json"
         
-        # Extract outline using the modular extractor
-        result = extract_pdf_outline(str(pdf_path), str(output_file))
+        # Extract outline using the modular extractor, then write it ourselves
+        result = extract_pdf_outline(str(pdf_path), pdf_data=pdf_data)
+        write_outline_json(result, str(output_file))
+        print(f"Output saved to {output_file}")
         
         processing_time = time.time() - start_time
         
@@ -49,6 +52,39 @@ def process_single_pdf(pdf_path: Path, output_dir: Path) -> dict:
         }
 
 
+def _read_ahead(pdf_files: list):
+    """Yield (pdf_path, pdf_bytes) pairs, reading the next PDF while the current one is processed"""
+    def read(pdf_path: Path):
+        try:
+            return pdf_path.read_bytes()
+        except OSError:
+            # Let the extractor open the path itself and report the error
+            return None
+    
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = reader.submit(read, pdf_files[0])
+        for i, pdf_file in enumerate(pdf_files):
+            pdf_data = pending.result()
+            if i + 1 < len(pdf_files):
+                pending = reader.submit(read, pdf_files[i + 1])
+            yield pdf_file, pdf_data
+
+
+# Output directory for pool workers, set once per worker by _init_worker
+_worker_output_dir = None
+
+
+def _init_worker(output_dir: str) -> None:
+    """Pool initializer: remember the output directory for this worker"""
+    global _worker_output_dir
+    _worker_output_dir = Path(output_dir)
+
+
+def _worker(pdf_path: str) -> dict:
+    """Pool task: process one PDF given as a path string"""
+    return process_single_pdf(Path(pdf_path), _worker_output_dir)
+
+
 def process_pdfs():
     """Main function to process all PDFs in the input directory"""
     # Docker container paths as specified in README
@@ -78,14 +114,21 @@ def process_pdfs():
     total_start_time = time.time()
     results = []
     
-    # Determine optimal number of workers (max 4 to stay within resource limits)
-    num_workers = min(4, mp.cpu_count(), len(pdf_files))
+    # Determine number of workers: PDF_WORKERS overrides the default of one per CPU.
+    # Memory scales with worker count, so lower it on memory-constrained hosts.
+    num_workers = min(worker_count_from_env(mp.cpu_count()), len(pdf_files))
     
     if len(pdf_files) == 1 or num_workers == 1:
-        # Process sequentially for single file or single worker
-        for pdf_file in pdf_files:
+        # Process sequentially for single file or single worker.
+        # PDF_PREFETCH=1 overlaps reading the next file with processing the current one.
+        if os.environ.get("PDF_PREFETCH") == "1":
+            pdf_inputs = _read_ahead(pdf_files)
+        else:
+            pdf_inputs = ((pdf_file, None) for pdf_file in pdf_files)
+        
+        for pdf_file, pdf_data in pdf_inputs:
             print(f"Processing: {pdf_file.name}")
-            result = process_single_pdf(pdf_file, output_dir)
+            result = process_single_pdf(pdf_file, output_dir, pdf_data)
             results.append(result)
             
             if result["success"]:
@@ -97,17 +140,18 @@ def process_pdfs():
         # Process in parallel for multiple files
         print(f"Processing with {num_workers} workers...")
         
-        with ProcessPoolExecutor(max_workers=num_workers) as executor:
-            # Submit all tasks
-            future_to_pdf = {
-                executor.submit(process_single_pdf, pdf_file, output_dir): pdf_file 
-                for pdf_file in pdf_files
-            }
-            
+        # Start the largest PDFs first so a big file doesn't straggle at the end
+        pdf_files.sort(key=lambda p: p.stat().st_size, reverse=True)
+        
+        # On Linux, fork workers so they inherit the already-imported extractor
+        # and its dependencies instead of re-importing them
+        ctx = mp.get_context("fork" if sys.platform.startswith("linux") else "spawn")
+        
+        # Recycle workers periodically to bound memory growth on long batches
+        with ctx.Pool(num_workers, initializer=_init_worker, initargs=(str(output_dir),),
+                      maxtasksperchild=4) as pool:
             # Collect results as they complete
-            for future in as_completed(future_to_pdf):
-                pdf_file = future_to_pdf[future]
-                result = future.result()
+            for result in pool.imap_unordered(_worker, [str(p) for p in pdf_files], chunksize=1):
                 results.append(result)
                 
                 if result["success"]:
@@ -3,7 +3,7 @@ PDF Processing Package for Adobe Hackathon Challenge 1a
 Modular PDF outline extraction system
 """
 
-from .pdf_extractor import PDFOutlineExtractor, extract_pdf_outline
+from .pdf_extractor import PDFOutlineExtractor, extract_pdf_outline, write_outline_json
 from .text_processor import TextProcessor
 from .content_filter import ContentFilter
 from .font_analyzer import FontAnalyzer
@@ -13,6 +13,7 @@ from .heading_classifier import HeadingClassifier
 __all__ = [
     "PDFOutlineExtractor",
     "extract_pdf_outline",
+    "write_outline_json",
     "TextProcessor",
     "ContentFilter", 
     "FontAnalyzer",
@@ -1,9 +1,326 @@
+import os
 import re
-from typing import List, Dict, Set, Tuple
-from collections import Counter
+import sys
+import multiprocessing as mp
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
+from typing import List, Dict, Set, Tuple, Optional
 import pdfplumber
 import numpy as np
-from .utils import is_page_number
+from .utils import BlockColumns, prepare_columns, is_page_number, worker_count_from_env
+
+try:
+    import hyperscan
+except ImportError:  # Optional: fall back to the compiled `re` alternations
+    hyperscan = None
+
+
+def _union(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """Compile a list of patterns into a single alternation"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+# TOC headings (lowercased, whitespace-normalized text)
+_TOC_HEADINGS = frozenset({"table of contents", "table of content", "contents", "content", "index", "toc"})
+
+
+@lru_cache(maxsize=4096)
+def _is_toc_heading_lower(lower: str) -> bool:
+    """is_toc_heading for text that is already lowercased"""
+    return " ".join(lower.split()) in _TOC_HEADINGS
+
+
+# TOC entry patterns
+_TOC_ENTRY_RE = _union([
+    # Pattern: "1. Introduction .................. 5"
+    r'.+\.{3,}.+\d+\s*$',
+    
+    # Pattern: "Chapter 1    Introduction    5"
+    r'^.+\s+\d+\s*$',
+    
+    # Pattern: "1.1 Overview 10"
+    r'^\d+(\.\d+)*\s+.+\s+\d+\s*$',
+    
+    # Pattern: "Introduction.....5" or "Introduction    5"
+    r'^[^\.]+[\.\s]{2,}\d+\s*$',
+    
+    # Pattern: Just page numbers on their own line in TOC
+    r'^\d{1,3}\s*$',
+    
+    # Pattern: "See page 15" or "Page 15"
+    r'.*(see\s+)?page\s+\d+',
+    
+    # Pattern: Multiple numbers with dots (subsection page refs)
+    r'^\d+\.\d+\s+\d+\.\d+\s+\d+',
+    
+    # Pattern: Title followed by page number with various separators
+    r'^.+[\.\-_\s]{2,}\d+\s*$',
+    
+    # Pattern: Roman numerals with page numbers
+    r'^[ivxlcdm]+[\.\s]+.+\s+\d+\s*$',
+], re.IGNORECASE)
+
+_TOC_PAGE_REF_RE = re.compile(r'\b\d{1,3}\b')
+
+# Every TOC entry pattern and the page-number heuristic need a digit
+_DIGIT_RE = re.compile(r'\d')
+
+# Table patterns to identify
+_TABLE_INDICATORS_RE = _union([
+    # Version history table patterns
+    r'^\d+\.\d+\s+\d+\s+(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+\d{4}',
+    
+    # Table of contents patterns with page numbers
+    r'^[\d\.]+\s+[\d\.]+$',  # Just numbers like "2.1 2.2"
+    
+    # Date patterns in tables
+    r'^\d{1,2}\s+(JUNE|JULY|NOVEMBER|DECEMBER)\s+\d{4}',
+    
+    # Multiple numbers separated by spaces (likely table data)
+    r'^\d+(\s+\d+)+$',
+    
+    # Copyright/page number patterns
+    r'^©.*\d{4}$',
+    r'^Page\s+\d+\s+of\s+\d+',
+    r'^Version\s+\d{4}',
+    r'May\s+\d{1,2},\s+\d{4}',
+    
+    # Table header patterns
+    r'^Version\s+Date\s+Remarks$',
+    r'^Syllabus\s+Days$',
+], re.IGNORECASE)
+
+# The only characters a table indicator can start with, besides digits
+# (case-insensitive, including the long s that re.IGNORECASE folds to "s")
+_TABLE_INDICATOR_FIRST_CHARS = frozenset(".©PpVvMmSsſ")
+
+# Additional table content patterns
+_TABLE_CONTENT_RE = _union([
+    # Multiple numbers/dots pattern (table of contents)
+    r'^\d+(\.\d+)*\s+\d+(\.\d+)*$',
+    
+    # Version/date patterns
+    r'^\d+\.\d+.*\d{4}',
+    
+    # Multiple short words/numbers (likely table cells)
+    r'^(\w{1,3}\s+){3,}',
+    
+    # Copyright and page info
+    r'^©.*International.*Board',
+    r'^Page\s+\d+',
+    r'^May\s+\d+,\s+\d{4}',
+    
+    # Very short standalone text (likely table data)
+    r'^\w{1,5}$',
+], re.IGNORECASE)
+
+# Allowance (in points) for text slightly outside detected table borders
+_TABLE_TOLERANCE = 5
+
+# Each visual table worker gets at least this many pages, so short documents run
+# in-process: starting a pool and reopening the PDF per worker costs more than it saves
+_TABLE_PAGES_PER_WORKER = 16
+
+# pdfplumber find_tables settings: ruled tables first, then text-aligned columns
+_STRICT_TABLE_SETTINGS = {
+    "vertical_strategy": "lines_strict",
+    "horizontal_strategy": "lines_strict",
+    "min_words_vertical": 2,
+    "min_words_horizontal": 2,
+}
+_LENIENT_TABLE_SETTINGS = {
+    "vertical_strategy": "text",
+    "horizontal_strategy": "text",
+    "intersection_tolerance": 15,
+    "min_words_vertical": 2,
+    "min_words_horizontal": 2,
+}
+
+# Common table header cell patterns (matched against lowercased cell text)
+_TABLE_HEADER_RE = _union([
+    r'(name|title|description|type|date|version|status|amount|quantity|id|no\.?)',
+    r'(s\.?no\.?|sr\.?no\.?|item|category|remarks|comments)',
+    r'(page|chapter|section|subsection)',
+])
+
+_NUMERIC_CELL_RE = re.compile(r'^\d+(\.\d+)?$')
+_DATE_CELL_RE = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2}')
+
+
+def _detect_page_tables(page) -> List[Tuple[Tuple[float, float, float, float], Optional[List[List]]]]:
+    """Find and validate one pdfplumber page's tables, returning (bbox, extracted data) pairs"""
+    # Detect tables using pdfplumber's table detection; "lines_strict" builds its grid from
+    # line objects only (not rect edges), so a page without any has no strict tables to find
+    tables = page.find_tables(table_settings=_STRICT_TABLE_SETTINGS) if page.lines else []
+    
+    if not tables:
+        # Try with more lenient settings if strict doesn't find anything
+        tables = page.find_tables(table_settings=_LENIENT_TABLE_SETTINGS)
+    
+    detected = []
+    for table in tables:
+        # Validate it's actually a table (multiple rows and columns), keeping the extracted cells
+        is_valid, table_data = _validate_table_structure(table)
+        if is_valid:
+            detected.append((table.bbox, table_data))
+    
+    return detected
+
+
+def _detect_tables_on_pages(pdf_path: str, page_numbers: range) -> List[Tuple[int, List]]:
+    """Worker entry point: open the PDF and run _detect_page_tables on the given 1-based pages"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(page_num, _detect_page_tables(pdf.pages[page_num - 1])) for page_num in page_numbers]
+
+
+def _validate_table_structure(table) -> Tuple[bool, Optional[List[List]]]:
+    """Validate that detected table has multiple rows and columns, returning (is_valid, extracted data)"""
+    table_data = None
+    try:
+        # Reject on the cell grid shape before pulling cell text, the costly part of extract()
+        grid_rows = table.rows
+        if len(grid_rows) < 2 or len(grid_rows[0].cells) < 2:
+            return False, None
+        
+        # Get table data
+        table_data = table.extract()
+        
+        if not table_data:
+            return False, table_data
+        
+        # Check minimum requirements for a table
+        rows = len(table_data)
+        cols = len(table_data[0]) if table_data[0] else 0
+        
+        # Must have at least 2 rows and 2 columns to be considered a table
+        if rows < 2 or cols < 2:
+            return False, table_data
+        
+        # Check that it's not just a single column of text (which might be a list)
+        if cols == 1:
+            return False, table_data
+        
+        # Verify there's actual content in multiple cells, stopping once 30% are known non-empty
+        total_cells = sum(len(row) for row in table_data)
+        non_empty_cells = 0
+        
+        for cell in chain.from_iterable(table_data):
+            if cell and str(cell).strip():
+                non_empty_cells += 1
+                if non_empty_cells / total_cells >= 0.3:
+                    break
+        
+        # At least 30% of cells should have content
+        if total_cells > 0 and (non_empty_cells / total_cells) < 0.3:
+            return False, table_data
+        
+        # Check for table-like patterns in content
+        has_headers = _has_table_headers(table_data)
+        has_structured_data = _has_structured_data(table_data)
+        
+        return has_headers or has_structured_data, table_data
+    
+    except Exception:
+        # If we can't extract data, use basic size heuristics
+        bbox = table.bbox
+        width = bbox[2] - bbox[0]
+        height = bbox[3] - bbox[1]
+        
+        # Must be reasonably sized
+        return width > 100 and height > 50, table_data
+
+
+def _has_table_headers(table_data: List[List]) -> bool:
+    """Check if first row looks like table headers"""
+    if not table_data or len(table_data) < 2:
+        return False
+    
+    first_row = table_data[0]
+    if not first_row:
+        return False
+    
+    header_like_count = 0
+    for cell in first_row:
+        # Stringify and lowercase each cell once
+        cell_text = str(cell).strip().lower() if cell else ""
+        
+        # Look for common table header patterns
+        if cell_text and _TABLE_HEADER_RE.search(cell_text):
+            header_like_count += 1
+    
+    # If more than half the cells look like headers
+    return header_like_count >= len(first_row) / 2
+
+
+def _has_structured_data(table_data: List[List]) -> bool:
+    """Check if table contains structured data patterns"""
+    if not table_data or len(table_data) < 2:
+        return False
+    
+    total_columns = len(table_data[0]) if table_data[0] else 0
+    
+    if total_columns == 0:
+        return False
+    
+    # Skip header row
+    body = table_data[1:]
+    
+    # Analyze each column, stopping at the first structured one
+    for col_idx in range(total_columns):
+        column_values = [str(row[col_idx]).strip() for row in body
+                         if col_idx < len(row) and row[col_idx]]
+        
+        if not column_values:
+            continue
+        
+        # Check if column contains mostly numbers
+        numeric_count = sum(1 for val in column_values if _NUMERIC_CELL_RE.match(val))
+        if numeric_count >= len(column_values) * 0.7:
+            return True
+        
+        # Check if column contains dates
+        date_count = sum(1 for val in column_values if _DATE_CELL_RE.search(val))
+        if date_count >= len(column_values) * 0.5:
+            return True
+    
+    return False
+
+
+# Pattern group ids reported by ContentFilter._scan_texts
+_TABLE_INDICATOR, _TABLE_CONTENT, _TOC_ENTRY = range(3)
+
+_PATTERN_GROUPS = {
+    _TABLE_INDICATOR: _TABLE_INDICATORS_RE,
+    _TABLE_CONTENT: _TABLE_CONTENT_RE,
+    _TOC_ENTRY: _TOC_ENTRY_RE,
+}
+
+
+@lru_cache(maxsize=None)
+def _hyperscan_database():
+    """Compile all pattern groups into one Hyperscan database, once per process"""
+    if hyperscan is None:
+        return None
+    
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            # re.match semantics: every group is anchored at the start of the text
+            expressions=[f"^(?:{regex.pattern})".encode("utf-8") for regex in _PATTERN_GROUPS.values()],
+            ids=list(_PATTERN_GROUPS),
+            elements=len(_PATTERN_GROUPS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_PATTERN_GROUPS),
+        )
+        return db
+    except Exception as e:
+        print(f"Warning: Could not compile Hyperscan database: {e}")
+        return None
+
+
+# Keywords marking long recurring footer text as boilerplate
+_FOOTER_KEYWORDS_RE = re.compile(r'copyright|©|page|confidential|proprietary|all rights reserved', re.IGNORECASE)
 
 
 class ContentFilter:
@@ -14,299 +331,166 @@ class ContentFilter:
         self.toc_pages: Set[int] = set()
         self.table_regions: Dict[int, List[Tuple[float, float, float, float]]] = {}  # page -> list of table bboxes
         self.visual_tables: Dict[int, List[Dict]] = {}  # page -> list of detected tables
+        self._table_index: Dict[int, Tuple[List[Tuple[float, float, float, float]], List[float], List[Tuple[float, float, float]]]] = {}  # page -> (indexed regions, sorted tops, (left, right, bottom))
+        self._scan_hits: Dict[str, Set[int]] = {}  # stripped text -> matched pattern groups
+        self._toc_entry_cache: Dict[str, bool] = {}  # stripped text -> is_toc_entry result
+        self._table_content_cache: Dict[str, bool] = {}  # stripped text -> table content regex result
     
-    def identify_visual_tables(self, pdf_path: str) -> None:
-        """Use pdfplumber to detect actual table structures visually"""
+    def identify_visual_tables(self, pdf_path: str, max_workers: Optional[int] = None) -> None:
+        """Use pdfplumber to detect actual table structures visually, fanning long documents out to worker processes"""
+        # Worker limit: the caller's, else PDF_WORKERS, else one per CPU
+        worker_limit = max_workers or worker_count_from_env(os.cpu_count() or 1)
+        
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Detect tables using pdfplumber's table detection
-                    tables = page.find_tables(table_settings={
-                        "vertical_strategy": "lines_strict",
-                        "horizontal_strategy": "lines_strict",
-                        "min_words_vertical": 2,
-                        "min_words_horizontal": 2,
-                    })
-                    
-                    if not tables:
-                        # Try with more lenient settings if strict doesn't find anything
-                        tables = page.find_tables(table_settings={
-                            "vertical_strategy": "text",
-                            "horizontal_strategy": "text",
-                            "intersection_tolerance": 15,
-                            "min_words_vertical": 2,
-                            "min_words_horizontal": 2,
-                        })
-                    
-                    self.visual_tables[page_num] = []
-                    self.table_regions[page_num] = []
-                    
-                    for table in tables:
-                        # Validate it's actually a table (multiple rows and columns)
-                        if self._is_valid_table_structure(table, page):
-                            table_bbox = table.bbox  # (x0, y0, x1, y1)
-                            self.table_regions[page_num].append(table_bbox)
-                            
-                            # Store table data for content analysis
-                            try:
-                                table_data = table.extract()
-                                self.visual_tables[page_num].append({
-                                    'bbox': table_bbox,
-                                    'data': table_data,
-                                    'rows': len(table_data) if table_data else 0,
-                                    'cols': len(table_data[0]) if table_data and table_data[0] else 0
-                                })
-                            except Exception:
-                                # If extraction fails, still mark the region as a table
-                                self.visual_tables[page_num].append({
-                                    'bbox': table_bbox,
-                                    'data': None,
-                                    'rows': 0,
-                                    'cols': 0
-                                })
+                num_pages = len(pdf.pages)
+                workers = min(worker_limit, num_pages // _TABLE_PAGES_PER_WORKER)
+                
+                # Daemonic pool workers (e.g. process_pdfs.py) cannot start children of their own
+                if workers <= 1 or mp.current_process().daemon:
+                    workers = 1
+                    for page_num, page in enumerate(pdf.pages, 1):
+                        self._record_page_tables(page_num, _detect_page_tables(page))
+            
+            if workers > 1:
+                # Stripe pages across workers so dense runs of table pages are shared out
+                page_chunks = [range(start, num_pages + 1, workers) for start in range(1, workers + 1)]
+                # forkserver children start from a clean server process, so this is safe even
+                # when the caller has threads running; the platform default is used elsewhere
+                ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else None)
+                try:
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+                        for chunk in executor.map(_detect_tables_on_pages, repeat(pdf_path), page_chunks):
+                            for page_num, tables in chunk:
+                                self._record_page_tables(page_num, tables)
+                except Exception as e:
+                    # e.g. a main module without an `if __name__ == "__main__":` guard
+                    print(f"Warning: Parallel visual table detection failed, running in-process: {e}")
+                    for page_num, tables in _detect_tables_on_pages(pdf_path, range(1, num_pages + 1)):
+                        self._record_page_tables(page_num, tables)
         
         except Exception as e:
             print(f"Warning: Could not perform visual table detection: {e}")
             # Fallback to pattern-based detection only
             pass
     
-    def _is_valid_table_structure(self, table, page) -> bool:
-        """Validate that detected table has multiple rows and columns"""
-        try:
-            # Get table data
-            table_data = table.extract()
-            
-            if not table_data:
-                return False
-            
-            # Check minimum requirements for a table
-            rows = len(table_data)
-            cols = len(table_data[0]) if table_data[0] else 0
-            
-            # Must have at least 2 rows and 2 columns to be considered a table
-            if rows < 2 or cols < 2:
-                return False
-            
-            # Check that it's not just a single column of text (which might be a list)
-            if cols == 1:
-                return False
-            
-            # Verify there's actual content in multiple cells
-            non_empty_cells = 0
-            total_cells = 0
-            
-            for row in table_data:
-                for cell in row:
-                    total_cells += 1
-                    if cell and str(cell).strip():
-                        non_empty_cells += 1
-            
-            # At least 30% of cells should have content
-            if total_cells > 0 and (non_empty_cells / total_cells) < 0.3:
-                return False
-            
-            # Check for table-like patterns in content
-            has_headers = self._has_table_headers(table_data)
-            has_structured_data = self._has_structured_data(table_data)
-            
-            return has_headers or has_structured_data
-        
-        except Exception:
-            # If we can't extract data, use basic size heuristics
-            bbox = table.bbox
-            width = bbox[2] - bbox[0]
-            height = bbox[3] - bbox[1]
-            
-            # Must be reasonably sized
-            return width > 100 and height > 50
+    def _record_page_tables(self, page_num: int, tables: List[Tuple[Tuple[float, float, float, float], Optional[List[List]]]]) -> None:
+        """Store one page's validated (bbox, extracted data) tables"""
+        self.visual_tables[page_num] = []
+        self.table_regions[page_num] = []
+        
+        for table_bbox, table_data in tables:
+            self.table_regions[page_num].append(table_bbox)
+            
+            # Store table data for content analysis; a failed extraction still marks the region
+            self.visual_tables[page_num].append({
+                'bbox': table_bbox,
+                'data': table_data,
+                'rows': len(table_data) if table_data else 0,
+                'cols': len(table_data[0]) if table_data and table_data[0] else 0
+            })
     
-    def _has_table_headers(self, table_data: List[List]) -> bool:
-        """Check if first row looks like table headers"""
-        if not table_data or len(table_data) < 2:
-            return False
-        
-        first_row = table_data[0]
-        if not first_row:
-            return False
-        
-        # Look for common table header patterns
-        header_patterns = [
-            r'(name|title|description|type|date|version|status|amount|quantity|id|no\.?)',
-            r'(s\.?no\.?|sr\.?no\.?|item|category|remarks|comments)',
-            r'(page|chapter|section|subsection)'
-        ]
-        
-        header_like_count = 0
-        for cell in first_row:
-            if cell and str(cell).strip():
-                cell_text = str(cell).lower().strip()
-                for pattern in header_patterns:
-                    if re.search(pattern, cell_text):
-                        header_like_count += 1
-                        break
-        
-        # If more than half the cells look like headers
-        return header_like_count >= len(first_row) / 2
-    
-    def _has_structured_data(self, table_data: List[List]) -> bool:
-        """Check if table contains structured data patterns"""
-        if not table_data or len(table_data) < 2:
-            return False
-        
-        # Look for patterns that suggest structured data
-        numeric_columns = 0
-        date_columns = 0
-        total_columns = len(table_data[0]) if table_data[0] else 0
-        
-        if total_columns == 0:
-            return False
-        
-        # Analyze each column
-        for col_idx in range(total_columns):
-            column_values = []
-            for row in table_data[1:]:  # Skip header row
-                if col_idx < len(row) and row[col_idx]:
-                    column_values.append(str(row[col_idx]).strip())
-            
-            if not column_values:
-                continue
-            
-            # Check if column contains mostly numbers
-            numeric_count = sum(1 for val in column_values if re.match(r'^\d+(\.\d+)?$', val))
-            if numeric_count >= len(column_values) * 0.7:
-                numeric_columns += 1
-            
-            # Check if column contains dates
-            date_count = sum(1 for val in column_values if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2}', val))
-            if date_count >= len(column_values) * 0.5:
-                date_columns += 1
-        
-        # If we have structured data patterns
-        return numeric_columns >= 1 or date_columns >= 1
+    def _index_page_tables(self, page: int, regions: List[Tuple[float, float, float, float]]) -> Tuple:
+        """Index one page's table regions by top edge (tolerance applied) for is_text_in_table"""
+        tolerance = _TABLE_TOLERANCE
+        
+        # Pages hold a handful of tables, so plain lists beat NumPy's per-call overhead
+        bboxes = sorted(regions, key=lambda bbox: bbox[1])
+        index = self._table_index[page] = (
+            list(regions),  # the regions indexed, to spot later edits to table_regions
+            [y0 - tolerance for _, y0, _, _ in bboxes],  # top, sorted ascending
+            [(x0 - tolerance, x1 + tolerance, y1 + tolerance) for x0, _, x1, y1 in bboxes],
+        )
+        return index
     
     def is_text_in_table(self, text_block: Dict) -> bool:
         """Check if a text block falls within any detected table region"""
-        page = text_block["page"]
+        regions = self.table_regions.get(text_block["page"])
         
-        if page not in self.table_regions:
+        if not regions:
             return False
         
         # Get text block position
         if "bbox" not in text_block:
             return False
         
-        text_bbox = text_block["bbox"]  # [x0, y0, x1, y1]
-        text_x0, text_y0, text_x1, text_y1 = text_bbox
+        # table_regions is public, so reindex the page whenever its regions were changed
+        index = self._table_index.get(text_block["page"])
+        if index is None or index[0] != regions:
+            index = self._index_page_tables(text_block["page"], regions)
         
-        # Check against all table regions on this page
-        for table_bbox in self.table_regions[page]:
-            table_x0, table_y0, table_x1, table_y1 = table_bbox
-            
-            # Check if text block overlaps with table region
-            # Allow small tolerance for text that might be slightly outside table borders
-            tolerance = 5
-            
-            if (text_x0 >= table_x0 - tolerance and 
-                text_x1 <= table_x1 + tolerance and
-                text_y0 >= table_y0 - tolerance and
-                text_y1 <= table_y1 + tolerance):
+        text_x0, text_y0, text_x1, text_y1 = text_block["bbox"]
+        _, tops, edges = index
+        
+        # Only tables whose top edge is at or above the text can contain it
+        for idx in range(bisect_right(tops, text_y0)):
+            left, right, bottom = edges[idx]
+            if text_x0 >= left and text_x1 <= right and text_y1 <= bottom:
                 return True
         
         return False
     
-    def identify_table_of_contents(self, text_blocks: List[Dict]) -> None:
+    def identify_table_of_contents(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> None:
         """Identify table of contents pages and content"""
+        self._identify_table_of_contents(columns if columns is not None else prepare_columns(text_blocks))
+    
+    def _identify_table_of_contents(self, columns: BlockColumns) -> None:
+        """Identify TOC pages and entries from prepared block columns"""
+        texts = columns.texts.tolist()
+        pages = columns.pages.tolist()
+        heading_indices = set()
+        
         # Step 1: Find TOC heading and identify TOC pages
-        for block in text_blocks:
-            text = block["text"].strip().lower()
-            
+        for idx, lower in enumerate(columns.lowers.tolist()):
             # Look for TOC headings
-            toc_patterns = [
-                r'^table\s+of\s+contents?$',
-                r'^contents?$',
-                r'^index$',
-                r'^\s*toc\s*$',
-            ]
-            
-            for pattern in toc_patterns:
-                if re.match(pattern, text, re.IGNORECASE):
-                    self.toc_pages.add(block["page"])
-                    # Also check adjacent pages for multi-page TOCs
-                    self.toc_pages.add(block["page"] + 1)
-                    if block["page"] > 1:
-                        self.toc_pages.add(block["page"] - 1)
-                    break
-        
-        # Step 2: Identify TOC content patterns on TOC pages
-        for block in text_blocks:
-            if block["page"] in self.toc_pages:
-                text = block["text"].strip()
-                
+            if _is_toc_heading_lower(lower):
+                heading_indices.add(idx)
+                page = pages[idx]
+                self.toc_pages.add(page)
+                # Also check adjacent pages for multi-page TOCs
+                self.toc_pages.add(page + 1)
+                if page > 1:
+                    self.toc_pages.add(page - 1)
+        
+        # Step 2: Identify TOC content patterns, visiting only blocks on TOC pages
+        for page in self.toc_pages:
+            for idx in columns.blocks_by_page.get(page, ()):
                 # Skip the TOC heading itself
-                if self.is_toc_heading(text):
+                if idx in heading_indices:
                     continue
                 
                 # Identify TOC entry patterns
-                if self.is_toc_entry(text):
+                text = texts[idx]
+                if self._is_toc_entry_stripped(text):
                     self.toc_content.add(text)
     
     def is_toc_heading(self, text: str) -> bool:
         """Check if text is a TOC heading (to preserve)"""
-        text_lower = text.strip().lower()
-        
-        toc_heading_patterns = [
-            r'^table\s+of\s+contents?$',
-            r'^contents?$',
-            r'^index$',
-            r'^\s*toc\s*$',
-        ]
-        
-        return any(re.match(pattern, text_lower) for pattern in toc_heading_patterns)
+        return _is_toc_heading_lower(text.lower())
     
     def is_toc_entry(self, text: str) -> bool:
         """Identify table of contents entries to filter out"""
-        text = text.strip()
-        
-        # Skip very short text
-        if len(text) < 3:
+        return self._is_toc_entry_stripped(text.strip())
+    
+    def _is_toc_entry_stripped(self, text: str) -> bool:
+        """is_toc_entry for text that is already stripped"""
+        # Repeated strings (headers, page numbers, captions) are classified once
+        is_entry = self._toc_entry_cache.get(text)
+        if is_entry is None:
+            is_entry = self._toc_entry_cache[text] = self._classify_toc_entry(text)
+        return is_entry
+    
+    def _classify_toc_entry(self, text: str) -> bool:
+        """Uncached TOC entry check on stripped text"""
+        # Skip very short text, and text without any digits
+        if len(text) < 3 or not _DIGIT_RE.search(text):
             return False
         
-        # TOC entry patterns
-        toc_entry_patterns = [
-            # Pattern: "1. Introduction .................. 5"
-            r'.+\.{3,}.+\d+\s*$',
-            
-            # Pattern: "Chapter 1    Introduction    5"
-            r'^.+\s+\d+\s*$',
-            
-            # Pattern: "1.1 Overview 10"
-            r'^\d+(\.\d+)*\s+.+\s+\d+\s*$',
-            
-            # Pattern: "Introduction.....5" or "Introduction    5"
-            r'^[^\.]+[\.\s]{2,}\d+\s*$',
-            
-            # Pattern: Just page numbers on their own line in TOC
-            r'^\d{1,3}\s*$',
-            
-            # Pattern: "See page 15" or "Page 15"
-            r'.*(see\s+)?page\s+\d+',
-            
-            # Pattern: Multiple numbers with dots (subsection page refs)
-            r'^\d+\.\d+\s+\d+\.\d+\s+\d+',
-            
-            # Pattern: Title followed by page number with various separators
-            r'^.+[\.\-_\s]{2,}\d+\s*$',
-            
-            # Pattern: Roman numerals with page numbers
-            r'^[ivxlcdm]+[\.\s]+.+\s+\d+\s*$',
-        ]
-        
-        for pattern in toc_entry_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True
+        if self._matches_group(text, _TOC_ENTRY):
+            return True
         
         # Additional heuristic: If on a TOC page and contains page numbers
-        if re.search(r'\b\d{1,3}\b', text):
+        if _TOC_PAGE_REF_RE.search(text):
             # Check if it looks like a TOC entry (has both text and numbers)
             words = text.split()
             has_text = any(word.isalpha() and len(word) > 2 for word in words)
@@ -317,131 +501,147 @@ class ContentFilter:
         
         return False
     
-    def identify_table_patterns(self, text_blocks: List[Dict]) -> None:
+    def identify_table_patterns(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> None:
         """Identify table content patterns to exclude from headings"""
-        for block in text_blocks:
-            text = block["text"].strip()
-            
-            # Table patterns to identify
-            table_indicators = [
-                # Version history table patterns
-                r'^\d+\.\d+\s+\d+\s+(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+\d{4}',
-                
-                # Table of contents patterns with page numbers
-                r'^[\d\.]+\s+[\d\.]+$',  # Just numbers like "2.1 2.2"
-                
-                # Date patterns in tables
-                r'^\d{1,2}\s+(JUNE|JULY|NOVEMBER|DECEMBER)\s+\d{4}',
-                
-                # Multiple numbers separated by spaces (likely table data)
-                r'^\d+(\s+\d+)+$',
-                
-                # Copyright/page number patterns
-                r'^©.*\d{4}$',
-                r'^Page\s+\d+\s+of\s+\d+',
-                r'^Version\s+\d{4}',
-                r'May\s+\d{1,2},\s+\d{4}',
-                
-                # Table header patterns
-                r'^Version\s+Date\s+Remarks$',
-                r'^Syllabus\s+Days$',
-            ]
+        # Only the text is needed, so blocks without position or font fields are accepted
+        texts = columns.texts.tolist() if columns is not None else [self._block_text(block) for block in text_blocks]
+        self._identify_table_patterns(texts)
+    
+    def _identify_table_patterns(self, texts: List[str]) -> None:
+        """Identify table patterns from stripped block texts"""
+        for text in texts:
+            first = text[:1]
+            if not (first.isdigit() or first in _TABLE_INDICATOR_FIRST_CHARS):
+                continue
             
-            for pattern in table_indicators:
-                if re.match(pattern, text, re.IGNORECASE):
-                    self.table_patterns.add(text)
-                    break
+            if self._matches_group(text, _TABLE_INDICATOR):
+                self.table_patterns.add(text)
     
-    def identify_headers_footers(self, text_blocks: List[Dict]) -> None:
+    def identify_headers_footers(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> None:
         """Identify recurring headers and footers, but preserve large non-repeating footer content"""
-        page_positions = {}
+        self._identify_headers_footers(columns if columns is not None else prepare_columns(text_blocks))
+    
+    def _identify_headers_footers(self, columns: BlockColumns) -> None:
+        """Identify recurring headers and footers from prepared block columns"""
+        texts, pages, y_top, page_height = columns.texts, columns.pages, columns.y_top, columns.page_height
         
-        for block in text_blocks:
-            page = block["page"]
-            y_pos = block["bbox"][1]
-            text = block["text"].strip()
-            
-            if page not in page_positions:
-                page_positions[page] = {"top": [], "bottom": []}
-            
-            # Top 15% of page (more restrictive for headers)
-            if y_pos < block["page_height"] * 0.15:
-                page_positions[page]["top"].append(text)
-            # Bottom 15% of page
-            elif y_pos > block["page_height"] * 0.85:
-                page_positions[page]["bottom"].append(text)
+        # Top 15% of page (more restrictive for headers), bottom 15% of page
+        top_mask = y_top < page_height * 0.15
+        bottom_mask = ~top_mask & (y_top > page_height * 0.85)
         
         # Find patterns that repeat across pages
-        all_tops = []
-        all_bottoms = []
-        
-        for page_data in page_positions.values():
-            all_tops.extend(page_data["top"])
-            all_bottoms.extend(page_data["bottom"])
-        
-        top_counter = Counter(all_tops)
-        bottom_counter = Counter(all_bottoms)
+        top_texts, top_counts = np.unique(texts[top_mask], return_counts=True)
+        bottom_texts, bottom_counts = np.unique(texts[bottom_mask], return_counts=True)
+        num_pages = np.unique(pages).size
         
         # Mark as headers/footers ONLY if they appear on multiple pages AND are short
-        min_occurrences = max(2, len(page_positions) // 3)
+        min_occurrences = max(2, num_pages // 3)
         
         # For headers - filter if recurring
-        for text, count in top_counter.items():
-            if count >= min_occurrences and not is_page_number(text):
+        for text in top_texts[top_counts >= min_occurrences].tolist():
+            if not is_page_number(text):
                 self.headers_footers.add(text)
         
         # For footers - be more selective
-        for text, count in bottom_counter.items():
-            if count >= min_occurrences:
-                if (len(text) < 50 or
-                    is_page_number(text) or
-                    any(keyword in text.lower() for keyword in 
-                        ['copyright', '©', 'page', 'confidential', 'proprietary', 'all rights reserved'])):
-                    self.headers_footers.add(text)
-                elif count >= len(page_positions) * 0.8:
-                    self.headers_footers.add(text)
+        recurring = bottom_counts >= min_occurrences
+        for text, count in zip(bottom_texts[recurring].tolist(), bottom_counts[recurring].tolist()):
+            if (len(text) < 50 or
+                is_page_number(text) or
+                _FOOTER_KEYWORDS_RE.search(text) is not None):
+                self.headers_footers.add(text)
+            elif count >= num_pages * 0.8:
+                self.headers_footers.add(text)
     
     def is_likely_table_content(self, text: str) -> bool:
         """Enhanced table content detection"""
-        text = text.strip()
-        
+        return self._is_likely_table_content_stripped(text.strip())
+    
+    def _is_likely_table_content_stripped(self, text: str) -> bool:
+        """is_likely_table_content for text that is already stripped"""
         # Already identified table patterns
         if text in self.table_patterns:
             return True
         
-        # Additional table patterns
-        table_patterns = [
-            # Multiple numbers/dots pattern (table of contents)
-            r'^\d+(\.\d+)*\s+\d+(\.\d+)*$',
-            
-            # Version/date patterns
-            r'^\d+\.\d+.*\d{4}',
-            
-            # Multiple short words/numbers (likely table cells)
-            r'^(\w{1,3}\s+){3,}',
-            
-            # Copyright and page info
-            r'^©.*International.*Board',
-            r'^Page\s+\d+',
-            r'^May\s+\d+,\s+\d{4}',
+        # Only the pattern match is cached; table_patterns can still grow
+        is_table = self._table_content_cache.get(text)
+        if is_table is None:
+            is_table = self._table_content_cache[text] = self._matches_group(text, _TABLE_CONTENT)
+        return is_table
+    
+    def _matches_group(self, text: str, group_id: int) -> bool:
+        """Check stripped text against a pattern group, reusing batch scan results when available"""
+        groups = self._scan_hits.get(text)
+        if groups is None:
+            return _PATTERN_GROUPS[group_id].match(text) is not None
+        return group_id in groups
+    
+    def _scan_texts(self, texts: List[str], hs_db=None) -> Dict[int, Set[int]]:
+        """Match every text against all pattern groups (with hs_db when given), returning text index -> matched group ids"""
+        hits: Dict[int, Set[int]] = {}
+        
+        def on_match(group_id, start, end, flags, idx):
+            hits.setdefault(idx, set()).add(group_id)
+        
+        for idx, text in enumerate(texts):
+            if hs_db is not None and text.isascii() and text.isprintable():
+                hs_db.scan(text.encode("ascii"), match_event_handler=on_match, context=idx)
+                continue
             
-            # Very short standalone text (likely table data)
-            r'^\w{1,5}$',
-        ]
+            # Hyperscan's \w and \s are ASCII-only and its \s lacks \x1c-\x1f, so Unicode
+            # text and text with control characters stay on the re path
+            for group_id, regex in _PATTERN_GROUPS.items():
+                if regex.match(text):
+                    hits.setdefault(idx, set()).add(group_id)
         
-        return any(re.match(pattern, text, re.IGNORECASE) for pattern in table_patterns)
+        return hits
+    
+    def _apply_pattern_scan(self, columns: BlockColumns, hs_db) -> None:
+        """Identify TOC and table pattern content from a single batch scan of all blocks"""
+        texts = columns.texts.tolist()
+        hits = self._scan_texts(texts, hs_db)
+        self._scan_hits = {text: hits.get(idx, set()) for idx, text in enumerate(texts)}
+        
+        # TOC entry checks now resolve from the scan results
+        self._identify_table_of_contents(columns)
+        
+        for idx, groups in hits.items():
+            if _TABLE_INDICATOR in groups:
+                self.table_patterns.add(texts[idx])
+    
+    def _block_text(self, block: Dict) -> str:
+        """Stripped block text, cached on the block by prepare_columns"""
+        text = block.get("_text")
+        if text is None:
+            text = block["_text"] = sys.intern(block["text"].strip())
+        return text
+    
+    def _block_lower(self, block: Dict) -> str:
+        """Lowercased stripped block text, cached on the block by prepare_columns"""
+        lower = block.get("_lower")
+        if lower is None:
+            lower = block["_lower"] = self._block_text(block).lower()
+        return lower
     
     def is_valid_content_block(self, block: Dict) -> bool:
         """Check if a block contains valid content (not table/header/footer/TOC content)"""
-        text = block["text"].strip()
-        
+        return self._is_valid_content(block, self._block_text(block), self._block_lower(block))
+    
+    def valid_content_mask(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> np.ndarray:
+        """Batch version of is_valid_content_block, returning one bool per block"""
+        if columns is None:
+            columns = prepare_columns(text_blocks)
+        
+        return np.fromiter(
+            map(self._is_valid_content, text_blocks, columns.texts.tolist(), columns.lowers.tolist()),
+            dtype=bool, count=len(text_blocks))
+    
+    def _is_valid_content(self, block: Dict, text: str, lower: str) -> bool:
+        """Content validity rules shared by is_valid_content_block and valid_content_mask"""
         # Basic filters
         if (len(text) < 5 or
-            text in self.table_patterns or
-            text in self.headers_footers or
-            text in self.toc_content or
+            self._is_excluded(text) or
             is_page_number(text) or
-            self.is_likely_table_content(text)):
+            self._is_likely_table_content_stripped(text)):
             return False
         
         # NEW: Strict visual table check - exclude any text inside detected tables
@@ -449,25 +649,46 @@ class ContentFilter:
             return False
         
         # Special case: Preserve TOC headings themselves
-        if self.is_toc_heading(text):
+        if _is_toc_heading_lower(lower):
             return True
         
         # Filter out TOC entries
-        if self.is_toc_entry(text):
+        if self._is_toc_entry_stripped(text):
             return False
         
         return True
 
-    def process_all_filters(self, text_blocks: List[Dict], pdf_path: str = None) -> None:
+    def process_all_filters(self, text_blocks: List[Dict], pdf_path: str = None,
+                            columns: Optional[BlockColumns] = None) -> None:
         """Run all filtering methods in the correct order"""
         # NEW: Visual table detection first (if PDF path is provided)
         if pdf_path:
             self.identify_visual_tables(pdf_path)
         
-        # Order matters: TOC identification should come first
-        self.identify_table_of_contents(text_blocks)
-        self.identify_table_patterns(text_blocks)
-        self.identify_headers_footers(text_blocks)
+        # Start a new document with empty classification caches
+        self._toc_entry_cache.clear()
+        self._table_content_cache.clear()
+        
+        # Extract and strip every block once for all detectors
+        if columns is None:
+            columns = prepare_columns(text_blocks)
+        
+        # Order matters: TOC identification should come first. The Hyperscan database
+        # is only compiled here, on first use, since the outline pipeline never needs it
+        hs_db = _hyperscan_database()
+        if hs_db is not None:
+            self._apply_pattern_scan(columns, hs_db)
+        else:
+            self._identify_table_of_contents(columns)
+            self._identify_table_patterns(columns.texts.tolist())
+        self._identify_headers_footers(columns)
+    
+    def _is_excluded(self, text: str) -> bool:
+        """Check text against the table pattern, header/footer and TOC sets"""
+        # The live sets are checked, so texts callers add to them directly are honored
+        return (text in self.table_patterns or
+                text in self.headers_footers or
+                text in self.toc_content)
     
     def get_table_debug_info(self) -> Dict:
         """Get debug information about detected tables"""
@@ -1,8 +1,20 @@
 """
 Font pattern analysis for determining heading hierarchy
 """
-from typing import List, Dict
-from collections import Counter
+from typing import List, Dict, Optional
+from operator import itemgetter
+import numpy as np
+from .utils import BlockColumns, prepare_columns
+
+
+# Block fields read by has_visual_distinction, fetched in one call per block
+_STYLE_FIELDS = itemgetter("flags", "font_size", "font_family")
+
+
+def _most_common(values: np.ndarray, first_seen: np.ndarray, counts: np.ndarray):
+    """Most frequent of np.unique's values, ties going to the earliest seen (as Counter.most_common)"""
+    is_top = counts == counts.max()
+    return values[is_top].tolist()[first_seen[is_top].argmin()]
 
 
 class FontAnalyzer:
@@ -10,37 +22,37 @@ class FontAnalyzer:
         self.content_filter = content_filter
         self.font_stats = None
     
-    def analyze_font_patterns(self, text_blocks: List[Dict]) -> Dict:
+    def analyze_font_patterns(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> Dict:
         """Analyze font patterns for proper heading hierarchy"""
+        if columns is None:
+            columns = prepare_columns(text_blocks)
+        
         # Filter out table content, headers/footers
-        valid_blocks = []
-        for block in text_blocks:
-            if self.content_filter.is_valid_content_block(block):
-                valid_blocks.append(block)
+        valid_mask = self.content_filter.valid_content_mask(text_blocks, columns)
         
-        if not valid_blocks:
+        if not valid_mask.any():
             return {
                 "body_font_size": 12.0,
                 "body_font_family": "Arial",
                 "font_size_hierarchy": []
             }
         
-        # Get font size distribution
-        font_sizes = [block["font_size"] for block in valid_blocks]
-        size_counter = Counter(font_sizes)
+        # Get font size distribution; np.unique returns the sizes sorted ascending
+        font_sizes = columns.font_size[valid_mask]
+        sizes, first_seen, counts = np.unique(font_sizes, return_index=True, return_counts=True)
         
         # Most common size is likely body text
-        body_font_size = size_counter.most_common(1)[0][0]
+        body_font_size = _most_common(sizes, first_seen, counts)
         
         # Create hierarchy from unique sizes, sorted descending
-        unique_sizes = sorted(set(font_sizes), reverse=True)
+        unique_sizes = sizes[::-1].tolist()
         
         # Separate heading sizes from body size
-        heading_sizes = [size for size in unique_sizes if size > body_font_size]
+        heading_sizes = sizes[sizes > body_font_size][::-1].tolist()
         
         # Get most common font family
-        font_families = [block["font_family"] for block in valid_blocks]
-        body_font_family = Counter(font_families).most_common(1)[0][0]
+        font_families = columns.font_family[valid_mask]
+        body_font_family = _most_common(*np.unique(font_families, return_index=True, return_counts=True))
         
         self.font_stats = {
             "body_font_size": body_font_size,
@@ -56,25 +68,30 @@ class FontAnalyzer:
         if not self.font_stats:
             return False
         
-        is_bold = bool(block["flags"] & 16)
-        is_italic = bool(block["flags"] & 2)
-        is_larger = block["font_size"] > self.font_stats["body_font_size"]
-        is_different_font = block["font_family"] != self.font_stats["body_font_family"]
+        flags, font_size, font_family = _STYLE_FIELDS(block)
+        is_bold = bool(flags & 16)
+        is_italic = bool(flags & 2)
+        is_larger = font_size > self.font_stats["body_font_size"]
+        is_different_font = font_family != self.font_stats["body_font_family"]
         
         return is_bold or is_italic or is_larger or is_different_font
     
+    def visual_distinction_mask(self, columns: BlockColumns) -> np.ndarray:
+        """Vectorized has_visual_distinction over prepared block columns"""
+        if not self.font_stats:
+            return np.zeros(len(columns.texts), dtype=bool)
+        
+        return (((columns.flags & (16 | 2)) != 0) |
+                (columns.font_size > self.font_stats["body_font_size"]) |
+                (columns.font_family != self.font_stats["body_font_family"]))
+    
     def get_font_size_level(self, font_size: float) -> int:
         """Get heading level based on font size hierarchy"""
         if not self.font_stats or not self.font_stats["font_size_hierarchy"]:
             return 2
         
-        hierarchy = self.font_stats["font_size_hierarchy"]
         body_size = self.font_stats["body_font_size"]
         
-        # Find relative position in size hierarchy
-        larger_sizes = [size for size in hierarchy if size > font_size]
-        position = len(larger_sizes)
-        
         if font_size > body_size + 2:
             return 1
         elif font_size > body_size:
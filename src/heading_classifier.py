@@ -1,6 +1,64 @@
 import re
 from typing import List, Dict, Optional
-from .utils import is_left_or_center_aligned, is_footer_area, clean_heading_text
+import numpy as np
+from .utils import BlockColumns, prepare_columns, is_left_or_center_aligned, left_or_center_aligned_mask, is_footer_area, clean_heading_text
+
+
+# Numeric prefix kinds returned by _classify_numeric_prefix
+_NO_PREFIX, _NUMBERED, _SUBSECTION = range(3)
+
+_WS_RE = re.compile(r'\s+')
+
+# Section names matched as whole words of lowercased text
+_SECTION_NAMES_RE = re.compile(r'\b(?:introduction|overview|contents?|references|acknowledgements|history|outcomes)\b')
+
+# Keyword lists matched as substrings of lowercased text, one alternation per list
+_FOOTER_KEYWORDS_RE = re.compile('copyright|©|page|confidential|proprietary')
+_TITLE_EXCLUDE_RE = re.compile('page|copyright|©|confidential|proprietary|draft')
+_TITLE_WORDS_RE = re.compile('foundation|level|extension|overview|guide|manual|report|study|analysis|framework')
+
+
+def _block_text(block: Dict) -> str:
+    """Stripped block text, using the copy cached by prepare_columns"""
+    text = block.get("_text")
+    return text if text is not None else block["text"].strip()
+
+
+def _block_lower(block: Dict) -> str:
+    """Lowercased stripped block text, using the cached copy when present"""
+    lower = block.get("_lower")
+    return lower if lower is not None else _block_text(block).lower()
+
+
+def _block_clean_text(block: Dict) -> str:
+    """clean_heading_text of the block text, cached on the block for the title check and the heading text"""
+    cleaned = block.get("_clean")
+    if cleaned is None:
+        cleaned = block["_clean"] = clean_heading_text(block["text"])
+    return cleaned
+
+
+def _classify_numeric_prefix(text: str) -> int:
+    """Classify a leading number as _NUMBERED ("1.") or _SUBSECTION ("2.1"), else _NO_PREFIX"""
+    i = 0
+    n = len(text)
+    while i < n and text[i].isdecimal():
+        i += 1
+    
+    if i == 0 or i >= n or text[i] != '.':
+        return _NO_PREFIX
+    
+    return _SUBSECTION if i + 1 < n and text[i + 1].isdecimal() else _NUMBERED
+
+
+def _is_title_fragment(clean_text: str, clean_title: str) -> bool:
+    """Check if cleaned text is longer than 5 chars and a substring covering over 30% of the title"""
+    # Length bounds first: a substring can't be longer than the title, and short ones can't reach 30%
+    text_len = len(clean_text)
+    title_len = len(clean_title)
+    return (5 < text_len <= title_len and
+            text_len / title_len > 0.3 and
+            clean_text in clean_title)
 
 
 class HeadingClassifier:
@@ -8,18 +66,35 @@ class HeadingClassifier:
         self.content_filter = content_filter
         self.font_analyzer = font_analyzer
         self.document_title = None  # Store detected title
+        self._clean_title_source = None  # document_title that _clean_title was computed from
+        self._clean_title = ""
     
-    def classify_headings(self, text_blocks: List[Dict]) -> List[Dict]:
+    def classify_headings(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> List[Dict]:
         """Classify text blocks as headings with proper filtering"""
+        if columns is None:
+            columns = prepare_columns(text_blocks)
+        
         # First detect the title
-        self.document_title = self.detect_title(text_blocks)
+        self.document_title = self.detect_title(text_blocks, columns)
+        
+        # Requirements of is_valid_heading that need no text analysis, checked for all blocks at once
+        texts = columns.texts.tolist()
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        candidate_mask = np.logical_and.reduce([
+            lengths >= 3,
+            lengths <= 200,
+            left_or_center_aligned_mask(columns.x_left, columns.page_width),
+            self.font_analyzer.visual_distinction_mask(columns),
+        ])
         
         headings = []
         
-        for block in text_blocks:
-            if self.is_valid_heading(block):
-                level = self.determine_heading_level(block)
-                clean_text = clean_heading_text(block["text"])
+        for idx in np.flatnonzero(candidate_mask).tolist():
+            block = text_blocks[idx]
+            numeric_prefix = _classify_numeric_prefix(texts[idx])
+            if self.is_valid_heading(block, numeric_prefix, visually_distinct=True):
+                level = self.determine_heading_level(block, numeric_prefix)
+                clean_text = _block_clean_text(block)
                 
                 headings.append({
                     "level": level,
@@ -31,24 +106,26 @@ class HeadingClassifier:
         
         return headings
     
-    def is_valid_heading(self, block: Dict) -> bool:
+    def is_valid_heading(self, block: Dict, numeric_prefix: Optional[int] = None,
+                         visually_distinct: Optional[bool] = None) -> bool:
         """Enhanced heading validation with footer content consideration and title exclusion"""
-        text = block["text"].strip()
+        text = _block_text(block)
+        if numeric_prefix is None:
+            numeric_prefix = _classify_numeric_prefix(text)
+        text_lower = _block_lower(block)
         
         # Exclude the document title from being classified as a heading
         # Check both exact match and if this block's text is contained in the title
         if self.document_title:
-            clean_block_text = clean_heading_text(text)
-            clean_title = clean_heading_text(self.document_title)
+            clean_block_text = _block_clean_text(block)
+            clean_title = self._clean_document_title()
             
             # Exact match
             if clean_block_text == clean_title:
                 return False
             
-            # Check if this block's text is part of the merged title
-            if (len(clean_block_text) > 5 and 
-                clean_block_text in clean_title and 
-                len(clean_block_text) / len(clean_title) > 0.3):  # At least 30% of title
+            # Check if this block's text is part of the merged title (at least 30% of title)
+            if _is_title_fragment(clean_block_text, clean_title):
                 return False
         
         # Basic filters
@@ -63,8 +140,7 @@ class HeadingClassifier:
             # If it's substantial content in footer area, consider it
             if (len(text) > 30 and  # Substantial text
                 is_footer_area(block) and  # In footer area
-                not any(keyword in text.lower() for keyword in 
-                       ['copyright', '©', 'page', 'confidential', 'proprietary'])):
+                not _FOOTER_KEYWORDS_RE.search(text_lower)):
                 # Allow it to be considered as heading if it has other heading characteristics
                 pass
             else:
@@ -74,35 +150,36 @@ class HeadingClassifier:
         if not is_left_or_center_aligned(block):
             return False
         
-        # Visual distinction check
-        has_visual_distinction = self.font_analyzer.has_visual_distinction(block)
+        # Visual distinction check (already known for blocks selected by the candidate mask)
+        if visually_distinct is None:
+            visually_distinct = self.font_analyzer.has_visual_distinction(block)
         
         # Check for heading patterns
-        is_numbered_heading = re.match(r'^\d+\.', text)
-        is_subsection = re.match(r'^\d+\.\d+', text)
-        is_section_name = any(word in text.lower() for word in 
-                             ["introduction", "overview", "content", "references", 
-                              "acknowledgements", "history", "outcomes"])
+        is_numbered_heading = numeric_prefix != _NO_PREFIX
+        is_subsection = numeric_prefix == _SUBSECTION
+        is_section_name = _SECTION_NAMES_RE.search(text_lower)
         
         # Accept if it has visual distinction AND looks like a heading
-        if has_visual_distinction:
+        if visually_distinct:
             # Must look like a proper heading
             if (is_numbered_heading or is_subsection or is_section_name or
                 text.endswith(':') or 
-                (text[0].isupper() and len(text.split()) <= 10)):
+                (text[0].isupper() and len(text.split(None, 10)) <= 10)):  # At most 10 words
                 return True
         
         return False
     
-    def determine_heading_level(self, block: Dict) -> str:
+    def determine_heading_level(self, block: Dict, numeric_prefix: Optional[int] = None) -> str:
         """Determine heading level based on font size and content"""
-        text = block["text"].strip()
+        text = _block_text(block)
         font_size = block["font_size"]
+        if numeric_prefix is None:
+            numeric_prefix = _classify_numeric_prefix(text)
         
-        # Content-based classification
-        if re.match(r'^\d+\.', text):  # "1.", "2.", etc.
+        # Content-based classification ("2.1" also starts with "2.")
+        if numeric_prefix != _NO_PREFIX:  # "1.", "2.", etc.
             return "H1"
-        elif re.match(r'^\d+\.\d+', text):  # "2.1", "2.2", etc.
+        elif numeric_prefix == _SUBSECTION:  # "2.1", "2.2", etc.
             return "H2"
         elif text in ["Revision History", "Table of Contents", "Acknowledgements"]:
             return "H1"
@@ -126,24 +203,21 @@ class HeadingClassifier:
             if self.content_filter.is_likely_table_content(text):
                 continue
             
+            # Clean the text (also used for the title comparison)
+            cleaned_text = clean_heading_text(text)
+            
             # Skip if it's the document title or part of it
             if self.document_title:
-                clean_text_heading = clean_heading_text(text)
-                clean_title = clean_heading_text(self.document_title)
+                clean_title = self._clean_document_title()
                 
                 # Exact match
-                if clean_text_heading == clean_title:
+                if cleaned_text == clean_title:
                     continue
                 
                 # Check if this heading text is a significant part of the title
-                if (len(clean_text_heading) > 5 and 
-                    clean_text_heading in clean_title and 
-                    len(clean_text_heading) / len(clean_title) > 0.3):
+                if _is_title_fragment(cleaned_text, clean_title):
                     continue
             
-            # Clean the text
-            cleaned_text = clean_heading_text(text)
-            
             if len(cleaned_text) >= 3:
                 validated.append({
                     "level": heading["level"],
@@ -153,22 +227,23 @@ class HeadingClassifier:
         
         return validated
     
-    def detect_title(self, text_blocks: List[Dict]) -> str:
+    def detect_title(self, text_blocks: List[Dict], columns: Optional[BlockColumns] = None) -> str:
         """Detect document title by finding the biggest text on first page(s) and merging nearby blocks"""
+        if columns is None:
+            columns = prepare_columns(text_blocks)
+        
         # Focus on first 2 pages only
-        early_blocks = [b for b in text_blocks if b["page"] <= 2]
+        early_mask = columns.pages <= 2
         
-        if not early_blocks:
+        if not early_mask.any():
             return "Untitled Document"
         
         # Find the maximum font size on the first pages
-        max_font_size = max(block["font_size"] for block in early_blocks)
+        max_font_size = columns.font_size[early_mask].max().item()
         
         # Get all blocks with the maximum font size or very close to it (within 3 points)
-        largest_text_blocks = [
-            block for block in early_blocks 
-            if abs(block["font_size"] - max_font_size) <= 3
-        ]
+        largest_mask = early_mask & (np.abs(columns.font_size - max_font_size) <= 3)
+        largest_text_blocks = [text_blocks[idx] for idx in np.flatnonzero(largest_mask).tolist()]
         
         # Group nearby blocks that could be part of the same title
         title_groups = self._group_nearby_title_blocks(largest_text_blocks)
@@ -194,12 +269,14 @@ class HeadingClassifier:
                 continue
             
             # Skip if it looks like header/footer content
-            if any(keyword in merged_text.lower() for keyword in 
-                   ['page', 'copyright', '©', 'confidential', 'proprietary', 'draft']):
+            merged_lower = merged_text.lower()
+            if _TITLE_EXCLUDE_RE.search(merged_lower):
                 continue
             
             # Calculate position score (prefer upper part of page)
-            y_position = primary_block["bbox"][1] if "bbox" in primary_block else 0
+            primary_page = primary_block["page"]
+            primary_bbox = primary_block.get("bbox")
+            y_position = primary_bbox[1] if primary_bbox is not None else 0
             page_height = primary_block.get("page_height", 792)  # Default PDF height
             position_ratio = 1 - (y_position / page_height)
             
@@ -217,9 +294,9 @@ class HeadingClassifier:
             score += position_ratio * 50
             
             # Page preference (first page most likely)
-            if primary_block["page"] == 1:
+            if primary_page == 1:
                 score += 30
-            elif primary_block["page"] == 2:
+            elif primary_page == 2:
                 score += 10
             
             # Content quality indicators
@@ -240,20 +317,18 @@ class HeadingClassifier:
                 score += 10
             
             # Penalize if it looks like a section heading
-            if re.match(r'^\d+\.', merged_text) or merged_text.endswith(':'):
+            if _classify_numeric_prefix(merged_text) != _NO_PREFIX or merged_text.endswith(':'):
                 score -= 40
             
             # Boost for common title words
-            title_words = ['foundation', 'level', 'extension', 'overview', 'guide', 
-                          'manual', 'report', 'study', 'analysis', 'framework']
-            if any(word in merged_text.lower() for word in title_words):
+            if _TITLE_WORDS_RE.search(merged_lower):
                 score += 15
             
             candidates.append({
                 "text": merged_text, 
                 "score": score,
                 "font_size": avg_font_size,
-                "page": primary_block["page"],
+                "page": primary_page,
                 "block_count": len(group)
             })
         
@@ -264,13 +339,13 @@ class HeadingClassifier:
             return clean_heading_text(best["text"])
         
         # Fallback: try to find any reasonably sized text on first page
-        first_page_blocks = [b for b in text_blocks if b["page"] == 1]
+        first_page_blocks = [text_blocks[idx] for idx in np.flatnonzero(columns.pages == 1).tolist()]
         if first_page_blocks:
             # Sort by font size and position
             first_page_blocks.sort(key=lambda x: (x["font_size"], -x["bbox"][1] if "bbox" in x else 0), reverse=True)
             
             for block in first_page_blocks[:5]:  # Check top 5 candidates
-                text = block["text"].strip()
+                text = _block_text(block)
                 if (5 <= len(text) <= 100 and 
                     not self.content_filter.is_likely_table_content(text) and
                     text not in self.content_filter.headers_footers):
@@ -318,21 +393,24 @@ class HeadingClassifier:
             return False
         
         # Allow small differences in font size (up to 5 points for title merging)
-        font_diff = abs(block1["font_size"] - block2["font_size"])
+        font_size1 = block1["font_size"]
+        font_size2 = block2["font_size"]
+        font_diff = abs(font_size1 - font_size2)
         if font_diff > 5:
             return False
         
         # Check vertical spacing - be more lenient for title blocks
-        if "bbox" in block1 and "bbox" in block2:
-            # Get bottom of first block and top of second block
-            block1_bottom = block1["bbox"][3]  # y2 coordinate
-            block2_top = block2["bbox"][1]     # y1 coordinate
+        bbox1 = block1.get("bbox")
+        bbox2 = block2.get("bbox")
+        if bbox1 is not None and bbox2 is not None:
+            block1_top, block1_bottom = bbox1[1], bbox1[3]  # y1, y2 coordinates
+            block2_top, block2_bottom = bbox2[1], bbox2[3]
             
-            # Calculate vertical gap
+            # Calculate vertical gap between bottom of first block and top of second block
             vertical_gap = abs(block2_top - block1_bottom)
             
             # For title blocks, allow larger gaps (up to 2x font size)
-            avg_font_size = (block1["font_size"] + block2["font_size"]) / 2
+            avg_font_size = (font_size1 + font_size2) / 2
             max_gap = avg_font_size * 2.0  # Allow gap up to 2x the font size
             
             if vertical_gap <= max_gap:
@@ -340,20 +418,21 @@ class HeadingClassifier:
             
             # Also check if blocks are on roughly the same horizontal line
             # (might be side-by-side title parts)
-            block1_center_y = (block1["bbox"][1] + block1["bbox"][3]) / 2
-            block2_center_y = (block2["bbox"][1] + block2["bbox"][3]) / 2
+            block1_center_y = (block1_top + block1_bottom) / 2
+            block2_center_y = (block2_top + block2_bottom) / 2
             
             if abs(block1_center_y - block2_center_y) <= avg_font_size * 0.5:
                 return True
         
         # Fallback: if we don't have bbox info, use text characteristics
-        text1 = block1["text"].strip()
-        text2 = block2["text"].strip()
+        text1 = _block_text(block1)
+        text2 = _block_text(block2)
         
         # If both blocks are reasonably short and look like title parts, merge them
         if (len(text1) <= 80 and len(text2) <= 80 and 
             not text1.endswith('.') and not text2.startswith('.') and
-            not re.match(r'^\d+\.', text1) and not re.match(r'^\d+\.', text2)):
+            _classify_numeric_prefix(text1) == _NO_PREFIX and
+            _classify_numeric_prefix(text2) == _NO_PREFIX):
             return True
         
         return False
@@ -371,7 +450,7 @@ class HeadingClassifier:
         
         merged_parts = []
         for block in sorted_group:
-            text = block["text"].strip()
+            text = _block_text(block)
             
             # Skip problematic individual parts
             if (len(text) < 1 or
@@ -388,10 +467,17 @@ class HeadingClassifier:
         merged_text = " ".join(merged_parts)
         
         # Clean up multiple spaces and normalize
-        merged_text = re.sub(r'\s+', ' ', merged_text).strip()
+        merged_text = _WS_RE.sub(' ', merged_text).strip()
         
         return merged_text
     
+    def _clean_document_title(self) -> str:
+        """clean_heading_text of the document title, recomputed only when the title changes"""
+        if self._clean_title_source is not self.document_title:
+            self._clean_title = clean_heading_text(self.document_title) if self.document_title else ""
+            self._clean_title_source = self.document_title
+        return self._clean_title
+    
     def get_document_title(self) -> Optional[str]:
         """Get the detected document title"""
         return self.document_title
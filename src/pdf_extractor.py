@@ -4,10 +4,16 @@ Main PDF outline extraction module
 import pymupdf  # PyMuPDF
 import json
 from typing import List, Dict
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json writer
+    orjson = None
 from .text_processor import TextProcessor
 from .content_filter import ContentFilter
 from .font_analyzer import FontAnalyzer
 from .heading_classifier import HeadingClassifier
+from .utils import prepare_columns
 
 
 class PDFOutlineExtractor:
@@ -17,29 +23,32 @@ class PDFOutlineExtractor:
         self.heading_classifier = HeadingClassifier(self.content_filter, self.font_analyzer)
         self.text_processor = TextProcessor()
     
-    def extract_outline(self, pdf_path: str, debug_output: str = None) -> Dict:
-        """Main method to extract outline from PDF"""
+    def extract_outline(self, pdf_path: str, debug_output: str = None, pdf_data: bytes = None) -> Dict:
+        """Main method to extract outline from PDF (read from pdf_data instead of disk when given)"""
         try:
             # Step 1: Extract text with formatting at block level
-            text_blocks = self.extract_formatted_text(pdf_path, debug_output)
+            text_blocks = self.extract_formatted_text(pdf_path, debug_output, pdf_data)
             
             if not text_blocks:
                 return {"title": "Empty Document", "outline": []}
             
+            # Build the columnar view of the blocks shared by every pass once
+            columns = prepare_columns(text_blocks)
+            
             # Step 2: Identify and filter table content
-            self.content_filter.identify_table_patterns(text_blocks)
+            self.content_filter.identify_table_patterns(text_blocks, columns)
             
             # Step 3: Identify headers/footers
-            self.content_filter.identify_headers_footers(text_blocks)
+            self.content_filter.identify_headers_footers(text_blocks, columns)
             
             # Step 4: Analyze font patterns for hierarchy
-            self.font_analyzer.analyze_font_patterns(text_blocks)
-            
-            # Step 5: Extract title
-            title = self.heading_classifier.detect_title(text_blocks)
+            self.font_analyzer.analyze_font_patterns(text_blocks, columns)
             
-            # Step 6: Extract headings with improved filtering
-            headings = self.heading_classifier.classify_headings(text_blocks)
+            # Step 5-6: Extract headings with improved filtering; classify_headings detects
+            # the title first (to exclude it from the headings), so reuse it rather than
+            # grouping and scoring the title candidates a second time
+            headings = self.heading_classifier.classify_headings(text_blocks, columns)
+            title = self.heading_classifier.get_document_title()
             
             # Step 7: Merge multi-line headings
             headings = self.text_processor.merge_multiline_headings(headings)
@@ -58,9 +67,12 @@ class PDFOutlineExtractor:
             traceback.print_exc()
             return {"title": "Error Processing Document", "outline": []}
 
-    def extract_formatted_text(self, pdf_path: str, debug_output: str = None) -> List[Dict]:
+    def extract_formatted_text(self, pdf_path: str, debug_output: str = None, pdf_data: bytes = None) -> List[Dict]:
         """Extract text elements with formatting at block level to preserve complete headings"""
-        doc = pymupdf.open(pdf_path)
+        if pdf_data is not None:
+            doc = pymupdf.open(stream=pdf_data, filetype="pdf")
+        else:
+            doc = pymupdf.open(pdf_path)
         all_text_blocks = []
         
         debug_file = None
@@ -110,10 +122,11 @@ class PDFOutlineExtractor:
         debug_file.write("=" * 50 + "\n\n")
 
 
-def extract_pdf_outline(pdf_path: str, output_path: str = None, debug_path: str = None) -> Dict:
+def extract_pdf_outline(pdf_path: str, output_path: str = None, debug_path: str = None,
+                        pdf_data: bytes = None) -> Dict:
     """Extract outline from PDF - Main function"""
     extractor = PDFOutlineExtractor()
-    result = extractor.extract_outline(pdf_path, debug_path)
+    result = extractor.extract_outline(pdf_path, debug_path, pdf_data)
     
     # Validate output format
     if not isinstance(result, dict) or "title" not in result or "outline" not in result:
@@ -137,10 +150,19 @@ def extract_pdf_outline(pdf_path: str, output_path: str = None, debug_path: str
     # Save to file if requested
     if output_path:
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            write_outline_json(result, output_path)
             print(f"Output saved to {output_path}")
         except Exception as e:
             print(f"Error saving output: {e}")
     
     return result
+
+
+def write_outline_json(result: Dict, output_path: str) -> None:
+    """Write an outline result as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
@@ -2,7 +2,18 @@
 Text processing utilities for PDF content
 """
 from typing import Dict, List
-from .utils import get_representative_span, get_block_bbox
+import pymupdf
+from .utils import get_representative_span
+
+
+# "dict" extraction without image blocks: only text blocks are used, and decoding
+# embedded image data was most of the extraction time on image-heavy pages
+_TEXT_FLAGS = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+
+
+def _span_left(span: Dict) -> float:
+    """Sort key: a span's left x coordinate"""
+    return span["bbox"][0]
 
 
 class TextProcessor:
@@ -14,33 +25,35 @@ class TextProcessor:
         all_text = []
         
         for line in block["lines"]:
-            line_text = ""
+            parts = []
+            ends_with_space = False
             prev_span_end = None
             
             # Sort spans by x-position
-            sorted_spans = sorted(line["spans"], key=lambda s: s["bbox"][0])
-            
-            for span in sorted_spans:
+            for span in sorted(line["spans"], key=_span_left):
                 span_text = span["text"]
-                span_start_x = span["bbox"][0]
+                span_bbox = span["bbox"]
                 
                 # Add spacing between spans if needed
-                if prev_span_end and span_start_x - prev_span_end > 3:
-                    if not line_text.endswith(' '):
-                        line_text += " "
+                if prev_span_end and span_bbox[0] - prev_span_end > 3 and not ends_with_space:
+                    parts.append(" ")
+                    ends_with_space = True
                 
-                line_text += span_text
-                prev_span_end = span["bbox"][2]
+                parts.append(span_text)
+                if span_text:
+                    ends_with_space = span_text.endswith(' ')
+                prev_span_end = span_bbox[2]
             
-            if line_text.strip():
-                all_text.append(line_text.strip())
+            line_text = "".join(parts).strip()
+            if line_text:
+                all_text.append(line_text)
         
         # Join lines with spaces for headings that might span multiple lines
         return " ".join(all_text)
     
     def extract_formatted_text_blocks(self, page, page_num: int) -> List[Dict]:
         """Extract text blocks with formatting from a single page"""
-        text_dict = page.get_text("dict")
+        text_dict = page.get_text("dict", flags=_TEXT_FLAGS)
         page_height = page.rect.height
         page_width = page.rect.width
         
@@ -51,17 +64,19 @@ class TextProcessor:
                 # Reconstruct complete text for the entire block
                 block_text = self.reconstruct_block_text(block)
                 
-                if block_text.strip():
+                # Lines are stripped and space-joined, so the text needs no further strip
+                if block_text:
                     # Get representative formatting for the block
                     representative_span = get_representative_span(block)
                     
                     if representative_span:
                         text_block = {
-                            "text": block_text.strip(),
+                            "text": block_text,
                             "font_size": round(representative_span["size"], 1),
                             "font_family": representative_span["font"],
                             "flags": representative_span["flags"],
-                            "bbox": get_block_bbox(block),
+                            # MuPDF's block bbox is already the union of its span bboxes
+                            "bbox": list(block["bbox"]),
                             "page": page_num,
                             "page_height": page_height,
                             "page_width": page_width,
@@ -1,8 +1,80 @@
 """
 Utility functions for PDF processing
 """
+import os
 import re
-from typing import List, Dict
+import sys
+from typing import List, Dict, NamedTuple
+import numpy as np
+
+
+# Page number forms: "12", "Page 3...", "3 of 10", roman numerals
+_PAGE_NUMBER_RE = re.compile(r'^(?:\d{1,3}$|Page\s+\d+|\d+\s+of\s+\d+$|[ivxlcdm]{1,6}$)', re.IGNORECASE)
+
+_WS_RE = re.compile(r'\s+')
+_LEADING_BULLETS_RE = re.compile(r'^[\•\-\*\+►▪▫◦‣⁃\s]+')
+
+# Stand-in for block fields other than text and page that prepare_columns finds missing:
+# NaN fails every comparison, so such blocks are never header/footer, aligned or larger text
+_NAN = float('nan')
+_NO_BBOX = (_NAN, _NAN, _NAN, _NAN)
+
+
+class BlockColumns(NamedTuple):
+    """Struct-of-arrays view of text blocks shared by the filter, font and heading passes"""
+    texts: np.ndarray         # object: stripped block text
+    lowers: np.ndarray        # object: lowercased stripped block text
+    pages: np.ndarray         # int32: page number
+    y_top: np.ndarray         # float64: bbox y0
+    page_height: np.ndarray   # float64: page height
+    x_left: np.ndarray        # float64: bbox x0
+    page_width: np.ndarray    # float64: page width
+    font_size: np.ndarray     # float64: font size
+    flags: np.ndarray         # int64: font flags
+    font_family: np.ndarray   # object: font family
+    blocks_by_page: Dict[int, List[int]]  # page -> indices of its blocks
+
+
+def prepare_columns(text_blocks: List[Dict]) -> BlockColumns:
+    """Extract stripped text, position and font columns in a single traversal"""
+    texts, lowers, pages, y_top, page_height = [], [], [], [], []
+    x_left, page_width, font_size, flags, font_family = [], [], [], [], []
+    blocks_by_page: Dict[int, List[int]] = {}
+    
+    for idx, block in enumerate(text_blocks):
+        page = block["page"]
+        bbox = block.get("bbox", _NO_BBOX)
+        
+        # Cache the stripped and lowercased text on the block for later per-block
+        # checks; interning makes repeated header/footer text compare and hash by identity
+        text = block["_text"] = sys.intern(block["text"].strip())
+        lower = block["_lower"] = text.lower()
+        texts.append(text)
+        lowers.append(lower)
+        pages.append(page)
+        y_top.append(bbox[1])
+        page_height.append(block.get("page_height", _NAN))
+        x_left.append(bbox[0])
+        # Font and width fields are only read by the font and heading passes
+        page_width.append(block.get("page_width", _NAN))
+        font_size.append(block.get("font_size", _NAN))
+        flags.append(block.get("flags", 0))
+        font_family.append(block.get("font_family", ""))
+        blocks_by_page.setdefault(page, []).append(idx)
+    
+    return BlockColumns(
+        texts=np.array(texts, dtype=object),
+        lowers=np.array(lowers, dtype=object),
+        pages=np.array(pages, dtype=np.int32),
+        y_top=np.array(y_top, dtype=np.float64),
+        page_height=np.array(page_height, dtype=np.float64),
+        x_left=np.array(x_left, dtype=np.float64),
+        page_width=np.array(page_width, dtype=np.float64),
+        font_size=np.array(font_size, dtype=np.float64),
+        flags=np.array(flags, dtype=np.int64),
+        font_family=np.array(font_family, dtype=object),
+        blocks_by_page=blocks_by_page,
+    )
 
 
 def is_left_or_center_aligned(block: Dict) -> bool:
@@ -15,18 +87,15 @@ def is_left_or_center_aligned(block: Dict) -> bool:
             abs(x_position - center_x) < page_width * 0.25)
 
 
+def left_or_center_aligned_mask(x_left, page_width):
+    """Vectorized is_left_or_center_aligned over NumPy x0 and page width columns"""
+    return ((x_left < page_width * 0.7) | 
+            (abs(x_left - page_width / 2) < page_width * 0.25))
+
+
 def is_page_number(text: str) -> bool:
     """Check if text is a page number"""
-    text = text.strip()
-    
-    patterns = [
-        r'^\d{1,3}$',
-        r'^Page\s+\d+',
-        r'^\d+\s+of\s+\d+$',
-        r'^[ivxlcdm]{1,6}$'
-    ]
-    
-    return any(re.match(pattern, text, re.IGNORECASE) for pattern in patterns)
+    return _PAGE_NUMBER_RE.match(text.strip()) is not None
 
 
 def is_footer_area(block: Dict) -> bool:
@@ -36,27 +105,6 @@ def is_footer_area(block: Dict) -> bool:
     return y_position > page_height * 0.85
 
 
-def get_block_bbox(block: Dict) -> List[float]:
-    """Get bounding box for entire block"""
-    if not block["lines"]:
-        return [0, 0, 0, 0]
-    
-    min_x = float('inf')
-    min_y = float('inf')
-    max_x = float('-inf')
-    max_y = float('-inf')
-    
-    for line in block["lines"]:
-        for span in line["spans"]:
-            bbox = span["bbox"]
-            min_x = min(min_x, bbox[0])
-            min_y = min(min_y, bbox[1])
-            max_x = max(max_x, bbox[2])
-            max_y = max(max_y, bbox[3])
-    
-    return [min_x, min_y, max_x, max_y]
-
-
 def get_representative_span(block: Dict) -> Dict:
     """Get representative span for formatting info, preferring largest or most prominent"""
     all_spans = []
@@ -90,21 +138,35 @@ def get_representative_span(block: Dict) -> Dict:
 def clean_heading_text(text: str) -> str:
     """Clean heading text"""
     # Normalize whitespace
-    cleaned = re.sub(r'\s+', ' ', text.strip())
+    cleaned = _WS_RE.sub(' ', text.strip())
     
     # Remove leading bullets
-    cleaned = re.sub(r'^[\•\-\*\+►▪▫◦‣⁃\s]+', '', cleaned)
+    cleaned = _LEADING_BULLETS_RE.sub('', cleaned)
     
     # Remove trailing periods if not abbreviations
-    if (cleaned.endswith('.') and 
-        len(cleaned.split()) > 1 and 
-        len(cleaned.split()[-1]) > 3):
-        cleaned = cleaned.rstrip('.')
+    if cleaned.endswith('.'):
+        # Splitting off only the last word is enough to know there are several words
+        words = cleaned.rsplit(None, 1)
+        if len(words) > 1 and len(words[-1]) > 3:
+            cleaned = cleaned.rstrip('.')
     
     return cleaned.strip()
 
 
 def clean_title_text(text: str) -> str:
     """Clean title text"""
-    cleaned = re.sub(r'\s+', ' ', text.strip())
+    cleaned = _WS_RE.sub(' ', text.strip())
     return cleaned
+
+
+def worker_count_from_env(default: int) -> int:
+    """Worker count from PDF_WORKERS, falling back to default when unset, 0 or invalid; never below 1"""
+    value = os.environ.get("PDF_WORKERS", "").strip()
+    
+    try:
+        workers = int(value) if value else 0
+    except ValueError:
+        print(f"Warning: Ignoring invalid PDF_WORKERS value {value!r}, falling back to {default}")
+        workers = 0
+    
+    return max(1, workers or default)
@@ -0,0 +1,98 @@
+"""
+Tests for ContentFilter
+"""
+import random
+import unittest
+
+from src.content_filter import ContentFilter, _hyperscan_database
+
+
+def _sample_texts():
+    """Block-like texts mixing pattern keywords, digits and every ASCII character"""
+    rng = random.Random(0)
+    words = ["Page", "page", "of", "See", "Version", "Date", "Remarks", "Syllabus", "Days",
+             "MAY", "May", "June", "2014", "1.2", "3", "©", "International", "Board", "iv",
+             "Chapter", "Introduction", ".....", "  ", "\t", "\x0b", "\x1c", "\x1f"]
+    chars = [chr(code) for code in range(128)]
+    
+    texts = ["Date\x1f6", "Introduction\x1c5", "1.1 Overview 10", "Page 3 of 10", "Version 2014"]
+    for _ in range(20000):
+        if rng.random() < 0.5:
+            text = "".join(rng.choice(chars) for _ in range(rng.randint(1, 12)))
+        else:
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        
+        # Block text reaches the scan already stripped
+        text = text.strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+@unittest.skipIf(_hyperscan_database() is None, "hyperscan is not installed")
+class TestHyperscanScan(unittest.TestCase):
+    def test_scan_matches_re_path(self):
+        """The Hyperscan batch scan finds exactly the pattern groups the re fallback finds"""
+        content_filter = ContentFilter()
+        texts = _sample_texts()
+        
+        hs_hits = content_filter._scan_texts(texts, _hyperscan_database())
+        re_hits = content_filter._scan_texts(texts)
+        
+        for idx, text in enumerate(texts):
+            self.assertEqual(hs_hits.get(idx, set()), re_hits.get(idx, set()), repr(text))
+
+
+class TestPartialBlocks(unittest.TestCase):
+    def test_filters_accept_blocks_without_font_fields(self):
+        """The filter passes only need text, page, bbox and page_height"""
+        blocks = [{"text": "Annual Report", "page": page, "bbox": [72, 20, 300, 34], "page_height": 792}
+                  for page in range(1, 5)]
+        blocks.append({"text": "1.2 3.4", "page": 1, "bbox": [72, 400, 200, 414], "page_height": 792})
+        
+        content_filter = ContentFilter()
+        content_filter.identify_table_of_contents(blocks)
+        content_filter.identify_table_patterns(blocks)
+        content_filter.identify_headers_footers(blocks)
+        
+        self.assertEqual(content_filter.headers_footers, {"Annual Report"})
+        self.assertEqual(content_filter.table_patterns, {"1.2 3.4"})
+        self.assertFalse(any(content_filter.is_valid_content_block(block) for block in blocks))
+    
+    def test_table_patterns_accept_text_only_blocks(self):
+        """Table pattern detection reads nothing but the text"""
+        content_filter = ContentFilter()
+        content_filter.identify_table_patterns([{"text": " 1.2 3.4 "}])
+        
+        self.assertEqual(content_filter.table_patterns, {"1.2 3.4"})
+    
+    def test_direct_table_region_writes_are_honored(self):
+        """Regions written straight to table_regions are used by is_text_in_table"""
+        block = {"text": "Revenue", "page": 1, "bbox": [10, 10, 20, 20]}
+        content_filter = ContentFilter()
+        content_filter.table_regions[1] = [(400, 400, 500, 500)]
+        self.assertFalse(content_filter.is_text_in_table(block))
+        
+        content_filter.table_regions[1] = [(0, 0, 300, 300)]
+        self.assertTrue(content_filter.is_text_in_table(block))
+        
+        content_filter.table_regions[1].clear()
+        self.assertFalse(content_filter.is_text_in_table(block))
+        
+        content_filter.table_regions[1].append((5, 5, 25, 25))
+        self.assertTrue(content_filter.is_text_in_table(block))
+    
+    def test_direct_set_additions_are_excluded(self):
+        """Text added straight to the public sets is filtered like detected text"""
+        block = {"text": "Quarterly Summary", "page": 1, "bbox": [72, 400, 300, 414], "page_height": 792}
+        content_filter = ContentFilter()
+        content_filter.identify_headers_footers([block])
+        self.assertTrue(content_filter.is_valid_content_block(block))
+        
+        content_filter.headers_footers.add("Quarterly Summary")
+        self.assertFalse(content_filter.is_valid_content_block(block))
+        self.assertFalse(content_filter.valid_content_mask([block]).any())
+
+
+if __name__ == "__main__":
+    unittest.main()